@@ -10,17 +10,13 @@ Functions:
 - main(): Runs the main application loop.
 """
 
-from src.interface.gui import create_gui
-from src.analysis.reporting import generate_report
-from src.visualization.charts import plot_category_pie
-from src.analysis.ml_models import forecast_expenses, predict_expenses, detect_anomalies
-from src.customization.settings import check_budget
-
 def main():
     """
     Runs the main application loop, providing a command-line interface.
 
     Allows users to choose actions like adding expenses, viewing reports, or running ML models.
+    Feature modules are imported inside their menu branch so that heavy dependencies (Prophet,
+    scikit-learn, Matplotlib, Tkinter) only load when first used.
 
     Returns:
         None
@@ -38,23 +34,31 @@ def main():
         choice = input("Enter choice (1-8): ")
         
         if choice == "1":
+            from src.interface.gui import create_gui
             create_gui()
         elif choice == "2":
+            from src.analysis.reporting import generate_report
             generate_report()
         elif choice == "3":
+            from src.visualization.charts import plot_category_pie
             plot_category_pie()
         elif choice == "4":
+            from src.analysis.ml_models import forecast_expenses
+            print("Loading forecasting model...")
             forecast = forecast_expenses()
             print(forecast.tail())
         elif choice == "5":
+            from src.analysis.ml_models import predict_expenses
             prediction = predict_expenses()
             print(f"Predicted expense: ${prediction:.2f}")
         elif choice == "6":
+            from src.analysis.ml_models import detect_anomalies
             anomalies = detect_anomalies()
             print(anomalies)
         elif choice == "7":
             category = input("Enter category: ")
             budget = float(input("Enter budget limit: "))
+            from src.customization.settings import check_budget
             check_budget(category, budget)
         elif choice == "8":
             break
@@ -8,16 +8,48 @@ using data from MongoDB.
 
 Functions:
 - forecast_expenses(): Forecasts future expenses using Prophet.
-- predict_expenses(): Predicts next month's expenses using linear regression.
+- forecast_expenses_by_category(n_jobs): Forecasts future expenses per category using parallel Prophet fits.
+- predict_expenses(): Predicts next month's expenses using least-squares linear regression.
 - detect_anomalies(): Detects unusual expenses using K-Means clustering.
 """
 
-from prophet import Prophet
-from sklearn.linear_model import LinearRegression
 from sklearn.cluster import KMeans
-from pymongo import MongoClient
+from sklearn.preprocessing import OneHotEncoder
+from joblib import Parallel, delayed
+from pymongoarrow.api import Schema, find_pandas_all
+from src.storage.database import get_db
 import pandas as pd
 import numpy as np
+import scipy.sparse
+from numba import njit, prange
+
+@njit(parallel=True, cache=True)
+def _anomaly_mask(distances):
+    """
+    Flags rows whose nearest-centroid distance exceeds the mean of all distances.
+
+    Equivalent to distances.min(axis=1) > distances.mean(), but reads the matrix once.
+
+    Args:
+        distances (numpy.ndarray): (N, K) array of distances to each cluster centroid.
+
+    Returns:
+        numpy.ndarray: Boolean mask of length N marking anomalous rows.
+    """
+    n, k = distances.shape
+    mins = np.empty(n, dtype=distances.dtype)
+    total = 0.0
+    for i in prange(n):
+        row_min = distances[i, 0]
+        row_sum = distances[i, 0]
+        for j in range(1, k):
+            d = distances[i, j]
+            row_sum += d
+            if d < row_min:
+                row_min = d
+        mins[i] = row_min
+        total += row_sum
+    return mins > total / (n * k)
 
 def forecast_expenses():
     """
@@ -26,19 +58,62 @@ def forecast_expenses():
     Retrieves data from MongoDB and predicts expenses for the next 30 days.
 
     Returns:
-        pandas.DataFrame: Forecast with dates ('ds') and predicted amounts ('yhat').
+        pandas.DataFrame: Forecast for the next 30 days with dates ('ds') and predicted amounts ('yhat').
     """
-    client = MongoClient("mongodb://localhost:27017/")
-    db = client["expense_tracker"]
+    db = get_db()
     expenses = db["expenses"]
-    df = pd.DataFrame(list(expenses.find({}, {"date": 1, "amount": 1})))
-    df["ds"] = pd.to_datetime(df["date"])
+    # Decode straight into Arrow columns instead of one Python dict per document
+    df = find_pandas_all(expenses, {}, schema=Schema({"date": str, "amount": float}))
+    df["ds"] = pd.to_datetime(df["date"], format="%Y-%m-%d", cache=True)  # Dates are stored as "YYYY-MM-DD"
     df["y"] = df["amount"]
     if len(df) < 2:
         return pd.DataFrame()  # Handle insufficient data
-    model = Prophet(yearly_seasonality=True, weekly_seasonality=True)
-    model.fit(df[["ds", "y"]])
-    future = model.make_future_dataframe(periods=30)
+    return _fit_one(df[["ds", "y"]])
+
+def forecast_expenses_by_category(n_jobs=-1):
+    """
+    Forecasts future expenses separately for each category using Prophet.
+
+    Retrieves data from MongoDB and fits one model per category in parallel worker processes,
+    predicting expenses for the next 30 days. Categories with fewer than 2 expenses are skipped.
+
+    Args:
+        n_jobs (int, optional): Number of worker processes; -1 uses all CPUs, 1 fits in-process.
+
+    Returns:
+        pandas.DataFrame: Forecasts with the category ('category'), dates ('ds') and predicted amounts ('yhat').
+    """
+    db = get_db()
+    expenses = db["expenses"]
+    df = find_pandas_all(expenses, {}, schema=Schema({"date": str, "amount": float, "category": str}))
+    df["ds"] = pd.to_datetime(df["date"], format="%Y-%m-%d", cache=True)
+    df["y"] = df["amount"]
+    groups = [(category, group[["ds", "y"]]) for category, group in df.groupby("category") if len(group) >= 2]
+    if not groups:
+        return pd.DataFrame()  # Handle insufficient data
+    # Each fit is independent, so run them in separate processes
+    forecasts = Parallel(n_jobs=n_jobs, backend="loky")(delayed(_fit_one)(group) for _, group in groups)
+    return pd.concat(
+        [forecast.assign(category=category) for (category, _), forecast in zip(groups, forecasts)],
+        ignore_index=True
+    )[["category", "ds", "yhat"]]
+
+def _fit_one(df):
+    """
+    Fits a Prophet model on one series and predicts the next 30 days.
+
+    Args:
+        df (pandas.DataFrame): History with dates ('ds') and amounts ('y').
+
+    Returns:
+        pandas.DataFrame: Forecast with dates ('ds') and predicted amounts ('yhat').
+    """
+    from prophet import Prophet  # Deferred: importing Prophet takes seconds
+    # Only 'yhat' is returned, so skip the uncertainty-interval sampling
+    model = Prophet(yearly_seasonality=True, weekly_seasonality=True, uncertainty_samples=0)
+    model.fit(df)
+    # Only the 30 future days are needed; predicting the history too multiplies the predict cost
+    future = model.make_future_dataframe(periods=30, include_history=False)
     forecast = model.predict(future)
     return forecast[["ds", "yhat"]]
 
@@ -46,26 +121,27 @@ def predict_expenses():
     """
     Predicts expenses for 30 days in the future using linear regression.
 
-    Retrieves data from MongoDB and fits a linear model based on days since earliest expense.
+    Retrieves data from MongoDB and fits a least-squares line of amount against days since the
+    earliest expense, computed in closed form with NumPy.
 
     Returns:
         float: Predicted expense amount.
     """
-    client = MongoClient("mongodb://localhost:27017/")
-    db = client["expense_tracker"]
+    db = get_db()
     expenses = db["expenses"]
-    df = pd.DataFrame(list(expenses.find({}, {"date": 1, "amount": 1})))
-    df["date"] = pd.to_datetime(df["date"])
-    df["days"] = (df["date"] - df["date"].min()).dt.days
-    X = df[["days"]]
-    y = df["amount"]
-    if len(df) < 2:
+    docs = list(expenses.find({}, {"date": 1, "amount": 1, "_id": 0}))
+    if len(docs) < 2:
         return 0.0  # Handle insufficient data
-    model = LinearRegression()
-    model.fit(X, y)
-    future_days = np.array([[df["days"].max() + 30]])
-    prediction = model.predict(future_days)
-    return prediction[0]
+    # Same parsing as forecast_expenses; also accepts unpadded dates such as '2025-5-3'
+    dates = pd.to_datetime([doc["date"] for doc in docs], format="%Y-%m-%d", cache=True)
+    dates = dates.to_numpy().astype("datetime64[D]")
+    y = np.fromiter((doc["amount"] for doc in docs), dtype=np.float64, count=len(docs))
+    x = (dates - dates.min()).astype(np.float64)
+    dx = x - x.mean()
+    denom = dx @ dx
+    slope = (dx @ (y - y.mean())) / denom if denom else 0.0  # All expenses on the same day
+    intercept = y.mean() - slope * x.mean()
+    return float(slope * (x.max() + 30) + intercept)
 
 def detect_anomalies():
     """
@@ -76,18 +152,20 @@ def detect_anomalies():
     Returns:
         pandas.DataFrame: DataFrame of anomalous expenses.
     """
-    client = MongoClient("mongodb://localhost:27017/")
-    db = client["expense_tracker"]
+    db = get_db()
     expenses = db["expenses"]
-    df = pd.DataFrame(list(expenses.find({}, {"amount": 1, "category": 1})))
+    # The schema leaves out '_id', so fit_predict never receives an ObjectId
+    df = find_pandas_all(expenses, {}, schema=Schema({"amount": float, "category": str}))
     if len(df) < 3:
         return pd.DataFrame()  # Handle insufficient data
-    # Drop the '_id' column (if present) so that fit_predict does not receive an ObjectId.
-    if "_id" in df.columns:
-        df = df.drop(columns=["_id"])
-    df_encoded = pd.get_dummies(df, columns=["category"], drop_first=True)
-    kmeans = KMeans(n_clusters=3)
-    df["cluster"] = kmeans.fit_predict(df_encoded)
-    distances = kmeans.transform(df_encoded)
-    anomalies = df[distances.min(axis=1) > distances.mean()]
+    # Sparse one-hot categories keep memory at O(N) instead of O(N * categories)
+    encoder = OneHotEncoder(sparse_output=True, drop="first", dtype=np.float32)
+    categories = encoder.fit_transform(df[["category"]])
+    amounts = scipy.sparse.csr_matrix(df[["amount"]].to_numpy(dtype=np.float32))
+    X = scipy.sparse.hstack([amounts, categories], format="csr")
+    kmeans = KMeans(n_clusters=3, n_init=10, algorithm="elkan")
+    df["cluster"] = kmeans.fit_predict(X)
+    distances = kmeans.transform(X)
+    mask = _anomaly_mask(distances)
+    anomalies = df.iloc[mask]
     return anomalies
\ No newline at end of file
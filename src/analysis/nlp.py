@@ -15,18 +15,19 @@ Functions:
 - predict_and_refine_payment(description, user_payment, model, vectorizer): Refines the payment method using similarity and NLP.
 
 Dependencies:
-- sklearn.feature_extraction.text.TfidfVectorizer
+- sklearn.feature_extraction.text.HashingVectorizer
 - sklearn.naive_bayes.MultinomialNB
-- pymongo.MongoClient
+- src.storage.database.get_db
 - pandas
-- difflib (built-in)
+- rapidfuzz
 """
 
-import difflib
-from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.feature_extraction.text import HashingVectorizer
 from sklearn.naive_bayes import MultinomialNB
-from pymongo import MongoClient
 import pandas as pd
+import numpy as np
+from rapidfuzz import process, fuzz
+from src.storage.database import get_db
 
 # Small set of example categories for similarity matching (not exhaustive)
 CATEGORY_EXAMPLES = {
@@ -44,13 +45,85 @@ PAYMENT_EXAMPLES = {
     "Credit Card": ["credit", "visa", "mastercard"]
 }
 
+# Flattened (example, general) pairs so a single extractOne call scans every example
+_CATEGORY_FLAT = [(example, general) for general, examples in CATEGORY_EXAMPLES.items() for example in examples]
+_CAT_CHOICES = [example for example, _ in _CATEGORY_FLAT]
+_PAYMENT_FLAT = [(example, general) for general, examples in PAYMENT_EXAMPLES.items() for example in examples]
+_PAY_CHOICES = [example for example, _ in _PAYMENT_FLAT]
+
+def _match_general(value, flat, choices):
+    """
+    Returns the general label of the example most similar to value, or 'Miscellaneous'.
+
+    A match must score above 80 out of 100.
+    """
+    match = process.extractOne(value, choices, scorer=fuzz.ratio, score_cutoff=80)
+    if match is None or match[1] <= 80:
+        return "Miscellaneous"
+    return flat[match[2]][1]
+
+# Fitted classifiers keyed by the collection size and last '_id' they were trained on
+_CAT_CACHE = {"n": -1, "last_id": None, "model": None, "vec": None}
+_PAY_CACHE = {"n": -1, "last_id": None, "model": None, "vec": None}
+
+# Stateless vectorizer shared by both classifiers; hashing needs no fitted vocabulary
+_VECTORIZER = HashingVectorizer(n_features=2**18, alternate_sign=False, stop_words="english")
+
+def _train_classifier(field, cache):
+    """
+    Trains or updates a Naive Bayes classifier that predicts field from expense descriptions.
+
+    New documents are found by '_id' order and passed to partial_fit. That is only done when
+    they account for the whole change in document count; otherwise documents were removed or
+    inserted with a smaller '_id', and the model is refit from scratch. It is also refit on first
+    use and when new documents carry a label the model has not seen.
+
+    Args:
+        field (str): The expense field to predict (e.g., 'category').
+        cache (dict): The module-level cache holding the model for this field.
+
+    Returns:
+        tuple: (MultinomialNB model, HashingVectorizer), or (None, None) if fewer than 2 records.
+    """
+    db = get_db()
+    expenses = db["expenses"]
+    n = expenses.estimated_document_count()
+    if n == cache["n"]:
+        return cache["model"], cache["vec"]  # Collection unchanged since last fit
+    projection = {"description": 1, field: 1}
+    columns = ["_id", "description", field]
+    model = cache["model"]
+    delta = None
+    if model is not None and n > cache["n"]:
+        records = list(expenses.find({"_id": {"$gt": cache["last_id"]}}, projection).sort("_id", 1))
+        delta = pd.DataFrame.from_records(records, columns=columns)
+        if n != cache["n"] + len(delta):
+            delta = None  # Documents were also removed or inserted out of '_id' order
+        elif not set(delta[field]).issubset(model.classes_):
+            delta = None  # partial_fit cannot learn new labels, so refit from scratch
+    if delta is not None:
+        model.partial_fit(_VECTORIZER.transform(delta["description"]), delta[field])
+        last_id = delta["_id"].iloc[-1]
+    else:
+        records = list(expenses.find({}, projection).sort("_id", 1))
+        data = pd.DataFrame.from_records(records, columns=columns)
+        if len(data) < 2:
+            model, last_id = None, None  # Handle insufficient data
+        else:
+            model = MultinomialNB()
+            model.partial_fit(_VECTORIZER.transform(data["description"]), data[field], classes=np.unique(data[field]))
+            last_id = data["_id"].iloc[-1]
+    vectorizer = _VECTORIZER if model is not None else None
+    cache.update(n=n, last_id=last_id, model=model, vec=vectorizer)
+    return model, vectorizer
+
 def get_general_category_from_similarity(category):
     """
     Maps a user-entered category to a general category using text similarity matching.
 
-    Compares the input category to a small set of example categories using difflib's
-    SequenceMatcher to compute similarity scores. Returns the general category with the
-    highest similarity score above a threshold (0.8), or 'Miscellaneous' if no match.
+    Compares the input category to a small set of example categories using rapidfuzz's
+    ratio scorer to compute similarity scores. Returns the general category with the highest
+    similarity score above a threshold (80 out of 100), or 'Miscellaneous' if no match.
 
     Args:
         category (str): The user-entered category (e.g., 'breakfast', 'coffe').
@@ -67,23 +140,15 @@ def get_general_category_from_similarity(category):
         'Miscellaneous'
     """
     category = category.lower().strip()
-    best_score = 0
-    best_category = "Miscellaneous"
-    for general, examples in CATEGORY_EXAMPLES.items():
-        for example in examples:
-            score = difflib.SequenceMatcher(None, category, example).ratio()
-            if score > best_score:
-                best_score = score
-                best_category = general
-    return best_category if best_score > 0.8 else "Miscellaneous"
+    return _match_general(category, _CATEGORY_FLAT, _CAT_CHOICES)
 
 def get_general_payment_method(payment_method):
     """
     Maps a user-entered payment method to a general payment method using text similarity matching.
 
-    Compares the input payment method to a small set of example payment methods using difflib's
-    SequenceMatcher to compute similarity scores. Returns the general payment method with the
-    highest similarity score above a threshold (0.8), or 'Miscellaneous' if no match.
+    Compares the input payment method to a small set of example payment methods using rapidfuzz's
+    ratio scorer to compute similarity scores. Returns the general payment method with the highest
+    similarity score above a threshold (80 out of 100), or 'Miscellaneous' if no match.
 
     Args:
         payment_method (str): The user-entered payment method (e.g., 'td debit', 'debit').
@@ -100,15 +165,7 @@ def get_general_payment_method(payment_method):
         'Miscellaneous'
     """
     payment_method = payment_method.lower().strip()
-    best_score = 0
-    best_payment = "Miscellaneous"
-    for general, examples in PAYMENT_EXAMPLES.items():
-        for example in examples:
-            score = difflib.SequenceMatcher(None, payment_method, example).ratio()
-            if score > best_score:
-                best_score = score
-                best_payment = general
-    return best_payment if best_score > 0.8 else "Miscellaneous"
+    return _match_general(payment_method, _PAYMENT_FLAT, _PAY_CHOICES)
 
 def train_category_classifier():
     """
@@ -116,10 +173,11 @@ def train_category_classifier():
 
     Retrieves expense data from the MongoDB 'expense_tracker' database, using descriptions
     and their associated categories to train a text classification model. Used as a fallback
-    when similarity matching fails to assign a general category.
+    when similarity matching fails to assign a general category. The fitted model is cached and
+    updated with only the newly added documents when the collection grows.
 
     Returns:
-        tuple: (MultinomialNB model, TfidfVectorizer) if sufficient data is available,
+        tuple: (MultinomialNB model, HashingVectorizer) if sufficient data is available,
                (None, None) if insufficient data (fewer than 2 records).
 
     Example:
@@ -127,18 +185,7 @@ def train_category_classifier():
         >>> model is None
         False  # Assuming sufficient data
     """
-    client = MongoClient("mongodb://localhost:27017/")
-    db = client["expense_tracker"]
-    expenses = db["expenses"]
-    data = pd.DataFrame(list(expenses.find({}, {"description": 1, "category": 1})))
-    if len(data) < 2:
-        return None, None  # Handle insufficient data
-    vectorizer = TfidfVectorizer(stop_words="english")
-    X = vectorizer.fit_transform(data["description"])
-    y = data["category"]
-    model = MultinomialNB()
-    model.fit(X, y)
-    return model, vectorizer
+    return _train_classifier("category", _CAT_CACHE)
 
 def train_payment_classifier():
     """
@@ -146,10 +193,11 @@ def train_payment_classifier():
 
     Retrieves expense data from the MongoDB 'expense_tracker' database, using descriptions
     and their associated payment methods to train a text classification model. Used as a fallback
-    when similarity matching fails to assign a general payment method.
+    when similarity matching fails to assign a general payment method. The fitted model is cached
+    and updated with only the newly added documents when the collection grows.
 
     Returns:
-        tuple: (MultinomialNB model, TfidfVectorizer) if sufficient data is available,
+        tuple: (MultinomialNB model, HashingVectorizer) if sufficient data is available,
                (None, None) if insufficient data (fewer than 2 records).
 
     Example:
@@ -157,18 +205,7 @@ def train_payment_classifier():
         >>> model is None
         False  # Assuming sufficient data
     """
-    client = MongoClient("mongodb://localhost:27017/")
-    db = client["expense_tracker"]
-    expenses = db["expenses"]
-    data = pd.DataFrame(list(expenses.find({}, {"description": 1, "payment_method": 1})))
-    if len(data) < 2:
-        return None, None  # Handle insufficient data
-    vectorizer = TfidfVectorizer(stop_words="english")
-    X = vectorizer.fit_transform(data["description"])
-    y = data["payment_method"]
-    model = MultinomialNB()
-    model.fit(X, y)
-    return model, vectorizer
+    return _train_classifier("payment_method", _PAY_CACHE)
 
 def predict_and_refine_category(description, user_category, model, vectorizer):
     """
@@ -181,7 +218,7 @@ def predict_and_refine_category(description, user_category, model, vectorizer):
         description (str): The expense description (e.g., 'Morning meal at diner').
         user_category (str): The user-entered category (e.g., 'breakfast').
         model (MultinomialNB): Trained Naive Bayes model for categories, or None if not trained.
-        vectorizer (TfidfVectorizer): Fitted vectorizer for categories, or None if not trained.
+        vectorizer (HashingVectorizer): Vectorizer for categories, or None if not trained.
 
     Returns:
         str: The refined general category (e.g., 'Food').
@@ -217,7 +254,7 @@ def predict_and_refine_payment(description, user_payment, model, vectorizer):
         description (str): The expense description (e.g., 'Paid with TD debit card').
         user_payment (str): The user-entered payment method (e.g., 'td debit').
         model (MultinomialNB): Trained Naive Bayes model for payment methods, or None if not trained.
-        vectorizer (TfidfVectorizer): Fitted vectorizer for payment methods, or None if not trained.
+        vectorizer (HashingVectorizer): Vectorizer for payment methods, or None if not trained.
 
     Returns:
         str: The refined general payment method (e.g., 'TD Debit').
@@ -9,8 +9,7 @@ Functions:
 - generate_report(): Prints total expenses, category-wise, and payment method-wise spending.
 """
 
-from pymongo import MongoClient
-import pandas as pd
+from src.storage.database import get_db
 
 def generate_report():
     """
@@ -18,19 +17,33 @@ def generate_report():
 
     Retrieves data from MongoDB, aggregates related categories (e.g., 'lunch' and 'dinner' as 'Food')
     and payment methods (e.g., 'TD debit' and 'td debit' as 'TD Debit'), and prints results.
+    The totals are computed server-side in a single aggregation so only the summary rows are
+    transferred.
 
     Returns:
         None
     """
-    client = MongoClient("mongodb://localhost:27017/")
-    db = client["expense_tracker"]
+    db = get_db()
     expenses = db["expenses"]
-    df = pd.DataFrame(list(expenses.find()))
-    total_expenses = df["amount"].sum()
-    category_summary = df.groupby("category")["amount"].sum()
-    payment_summary = df.groupby("payment_method")["amount"].sum()
+    pipeline = [
+        {"$facet": {
+            "total": [{"$group": {"_id": None, "total": {"$sum": "$amount"}}}],
+            "category": [
+                {"$group": {"_id": "$category", "total": {"$sum": "$amount"}}},
+                {"$sort": {"_id": 1}}
+            ],
+            "payment_method": [
+                {"$group": {"_id": "$payment_method", "total": {"$sum": "$amount"}}},
+                {"$sort": {"_id": 1}}
+            ]
+        }}
+    ]
+    summary = next(expenses.aggregate(pipeline))
+    total_expenses = summary["total"][0]["total"] if summary["total"] else 0.0
     print(f"Total Expenses: ${total_expenses:.2f}")
     print("\nCategory-wise Spending:")
-    print(category_summary)
+    for row in summary["category"]:
+        print(f"{row['_id']}: ${row['total']:.2f}")
     print("\nPayment Method-wise Spending:")
-    print(payment_summary)
\ No newline at end of file
+    for row in summary["payment_method"]:
+        print(f"{row['_id']}: ${row['total']:.2f}")
\ No newline at end of file
@@ -7,14 +7,13 @@ Functions:
 - check_budget(category, budget_limit): Checks if spending in a category exceeds the budget.
 """
 
-from pymongo import MongoClient
-import pandas as pd 
+from src.storage.database import get_db
 
 def check_budget(category, budget_limit):
     """
     Checks if spending in a category exceeds the specified budget limit.
 
-    Retrieves data from MongoDB and prints an alert if the budget is exceeded.
+    Sums the category's spending in MongoDB and prints an alert if the budget is exceeded.
 
     Args:
         category (str): The expense category (e.g., 'Food').
@@ -23,10 +22,13 @@ def check_budget(category, budget_limit):
     Returns:
         None
     """
-    client = MongoClient("mongodb://localhost:27017/")
-    db = client["expense_tracker"]
+    db = get_db()
     expenses = db["expenses"]
-    df = pd.DataFrame(list(expenses.find({"category": category}, {"amount": 1})))
-    total_spent = df["amount"].sum()
+    pipeline = [
+        {"$match": {"category": category}},
+        {"$group": {"_id": None, "t": {"$sum": "$amount"}}}
+    ]
+    doc = next(expenses.aggregate(pipeline), None)
+    total_spent = float(doc["t"]) if doc else 0.0  # Plain float; no DataFrame needed for one value
     if total_spent > budget_limit:
         print(f"Alert: {category} spending (${total_spent:.2f}) exceeds budget (${budget_limit:.2f})")
\ No newline at end of file
@@ -1,7 +1,26 @@
 import tkinter as tk
 from tkinter import messagebox
+from PIL import Image, ImageDraw, ImageTk
 from src.storage.database import add_expense_db
 
+def _rounded_background(width, height, radius, fill, background):
+    """
+    Renders a rounded rectangle once into an image used as the container background.
+
+    Args:
+        width (int): Image width in pixels.
+        height (int): Image height in pixels.
+        radius (int): Corner radius in pixels.
+        fill (str): Color of the rounded rectangle.
+        background (str): Color shown outside the rounded corners.
+
+    Returns:
+        ImageTk.PhotoImage: The rendered background image.
+    """
+    image = Image.new("RGB", (width, height), background)
+    ImageDraw.Draw(image).rounded_rectangle((0, 0, width - 1, height - 1), radius=radius, fill=fill)
+    return ImageTk.PhotoImage(image)
+
 def create_gui():
     """
     Creates a Tkinter GUI for entering expense data with a styled design.
@@ -20,15 +39,12 @@ def create_gui():
     # Main frame with white background and rounded corners
     frame = tk.Frame(window, bg="white", bd=0)
     frame.place(relx=0.5, rely=0.5, anchor="center", width=300, height=400)
-    # Simulate rounded corners with a canvas
+    # Rounded corners are pre-rendered into a single image drawn on the canvas
     canvas = tk.Canvas(frame, bg="white", bd=0, highlightthickness=0, width=300, height=400)
     canvas.pack()
-    canvas.create_oval(0, 0, 40, 40, fill="white", outline="white")  # Top-left corner
-    canvas.create_oval(260, 0, 300, 40, fill="white", outline="white")  # Top-right corner
-    canvas.create_oval(0, 360, 40, 400, fill="white", outline="white")  # Bottom-left corner
-    canvas.create_oval(260, 360, 300, 400, fill="white", outline="white")  # Bottom-right corner
-    canvas.create_rectangle(20, 0, 280, 400, fill="white", outline="white")  # Middle fill
-    canvas.create_rectangle(0, 20, 300, 380, fill="white", outline="white")  # Middle fill
+    background = _rounded_background(300, 400, 20, "white", "#E6E6FA")
+    canvas.create_image(0, 0, anchor="nw", image=background)
+    canvas.image = background  # Keep a reference so the image is not garbage collected
 
     # Title
     tk.Label(frame, text="Expense Tracker", font=("Arial", 14, "bold"), bg="white").place(x=10, y=20)
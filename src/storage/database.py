@@ -5,23 +5,66 @@ This module provides functions to initialize the MongoDB connection, manage expe
 and refine categories and payment methods using similarity matching and NLP.
 
 Functions:
-- init_db(): Initializes and returns the MongoDB database connection.
+- get_db(): Returns the 'expense_tracker' database using a cached MongoClient.
+- init_db(): Initializes and returns the MongoDB database connection, creating its indexes once.
 - add_expense_db(date, amount, category, description, payment_method, category_model, category_vectorizer, payment_model, payment_vectorizer): Adds an expense with refined category and payment method.
+- add_expenses_db(rows, category_model, category_vectorizer, payment_model, payment_vectorizer): Adds several expenses in one batch insert.
 - get_all_expenses(): Retrieves all expenses from MongoDB.
 """
 
 from pymongo import MongoClient
-from src.analysis.nlp import get_general_category_from_similarity, get_general_payment_method, predict_and_refine_category, predict_and_refine_payment
+
+# Shared MongoClient, created on first use so every caller reuses one connection pool
+_CLIENT = None
+# Set once init_db has created the collection's indexes in this process
+_INDEXES_READY = False
+
+def get_db():
+    """
+    Returns the 'expense_tracker' database using a lazily created, cached MongoClient.
+
+    The client is created on the first call and reused afterwards, so callers do not pay
+    the connection handshake and topology discovery on every invocation.
+
+    Returns:
+        pymongo.database.Database: The MongoDB database object for 'expense_tracker'.
+    """
+    global _CLIENT
+    if _CLIENT is None:
+        _CLIENT = MongoClient("mongodb://localhost:27017/", maxPoolSize=10)
+    return _CLIENT["expense_tracker"]
+
+def _create_indexes(db):
+    """
+    Creates the index used by budget queries on the 'expenses' collection.
+
+    create_index is a no-op when the index already exists, so this is safe to run on every start.
+
+    Args:
+        db (pymongo.database.Database): The 'expense_tracker' database.
+
+    Returns:
+        None
+    """
+    expenses = db["expenses"]
+    expenses.create_index([("category", 1)])  # check_budget filters by category
 
 def init_db():
     """
     Initializes the MongoDB connection and returns the database object.
 
+    Reuses the cached client from get_db and creates the collection's indexes on the first
+    successful call in the process. If index creation fails, the client stays cached and the
+    next call retries.
+
     Returns:
         pymongo.database.Database: The MongoDB database object for 'expense_tracker'.
     """
-    client = MongoClient("mongodb://localhost:27017/")
-    db = client["expense_tracker"]
+    global _INDEXES_READY
+    db = get_db()
+    if not _INDEXES_READY:
+        _create_indexes(db)
+        _INDEXES_READY = True
     return db
 
 def add_expense_db(date, amount, category, description, payment_method, category_model=None, category_vectorizer=None, payment_model=None, payment_vectorizer=None):
@@ -38,15 +81,66 @@ def add_expense_db(date, amount, category, description, payment_method, category
         description (str): Description of the expense.
         payment_method (str): User-entered payment method (e.g., 'td debit').
         category_model (MultinomialNB, optional): Trained Naive Bayes model for categories.
-        category_vectorizer (TfidfVectorizer, optional): Fitted vectorizer for categories.
+        category_vectorizer (HashingVectorizer, optional): Vectorizer for categories.
         payment_model (MultinomialNB, optional): Trained Naive Bayes model for payment methods.
-        payment_vectorizer (TfidfVectorizer, optional): Fitted vectorizer for payment methods.
+        payment_vectorizer (HashingVectorizer, optional): Vectorizer for payment methods.
 
     Returns:
         None
     """
     db = init_db()
     expenses = db["expenses"]
+    expense = _build_doc(date, amount, category, description, payment_method, category_model, category_vectorizer, payment_model, payment_vectorizer)
+    expenses.insert_one(expense)
+
+def add_expenses_db(rows, category_model=None, category_vectorizer=None, payment_model=None, payment_vectorizer=None):
+    """
+    Adds several expenses to the MongoDB 'expenses' collection in a single batch insert.
+
+    Each row is refined the same way as in add_expense_db, then all documents are written with
+    one unordered insert_many, so the round trip is paid once per batch instead of once per expense.
+
+    Args:
+        rows (list): Dicts with 'date', 'amount', 'category', 'description' and 'payment_method' keys.
+        category_model (MultinomialNB, optional): Trained Naive Bayes model for categories.
+        category_vectorizer (HashingVectorizer, optional): Vectorizer for categories.
+        payment_model (MultinomialNB, optional): Trained Naive Bayes model for payment methods.
+        payment_vectorizer (HashingVectorizer, optional): Vectorizer for payment methods.
+
+    Returns:
+        None
+    """
+    docs = [
+        _build_doc(**row, category_model=category_model, category_vectorizer=category_vectorizer,
+                   payment_model=payment_model, payment_vectorizer=payment_vectorizer)
+        for row in rows
+    ]
+    if not docs:
+        return  # insert_many rejects an empty batch
+    db = init_db()
+    expenses = db["expenses"]
+    expenses.insert_many(docs, ordered=False)
+
+def _build_doc(date, amount, category, description, payment_method, category_model=None, category_vectorizer=None, payment_model=None, payment_vectorizer=None):
+    """
+    Builds an expense document with refined category and payment method.
+
+    Args:
+        date (str): Date of the expense (e.g., '2025-05-20').
+        amount (float): Amount spent.
+        category (str): User-entered category (e.g., 'Coffee').
+        description (str): Description of the expense.
+        payment_method (str): User-entered payment method (e.g., 'td debit').
+        category_model (MultinomialNB, optional): Trained Naive Bayes model for categories.
+        category_vectorizer (HashingVectorizer, optional): Vectorizer for categories.
+        payment_model (MultinomialNB, optional): Trained Naive Bayes model for payment methods.
+        payment_vectorizer (HashingVectorizer, optional): Vectorizer for payment methods.
+
+    Returns:
+        dict: The expense document to insert.
+    """
+    # Deferred so that importing the storage layer does not load scikit-learn and pandas
+    from src.analysis.nlp import get_general_category_from_similarity, get_general_payment_method, predict_and_refine_category, predict_and_refine_payment
     refined_category = get_general_category_from_similarity(category)
     refined_payment = get_general_payment_method(payment_method)
     # Use predict_and_refine_* as fallback if similarity returns 'Miscellaneous'
@@ -63,7 +157,7 @@ def add_expense_db(date, amount, category, description, payment_method, category
         "payment_method": refined_payment,  # Store refined payment method
         "original_payment_method": payment_method  # Store user-entered payment method for reference
     }
-    expenses.insert_one(expense)
+    return expense
 
 def get_all_expenses():
     """
@@ -72,6 +166,6 @@ def get_all_expenses():
     Returns:
         list: List of expense documents.
     """
-    db = init_db()
+    db = get_db()
     expenses = db["expenses"]
     return list(expenses.find())
\ No newline at end of file
@@ -9,27 +9,44 @@ Functions:
 - plot_payment_pie(): Creates a pie chart of spending by aggregated general payment method.
 """
 
-import pandas as pd
 import matplotlib.pyplot as plt
-from pymongo import MongoClient
+from src.storage.database import get_db
+
+def _sum_by(field):
+    """
+    Sums expense amounts per value of the given field using a MongoDB aggregation.
+
+    Args:
+        field (str): The expense field to group by (e.g., 'category').
+
+    Returns:
+        tuple: (labels, sizes) sorted by label, or ((), ()) if there are no expenses.
+    """
+    db = get_db()
+    expenses = db["expenses"]
+    cursor = expenses.aggregate([
+        {"$group": {"_id": f"${field}", "t": {"$sum": "$amount"}}},
+        {"$sort": {"_id": 1}}
+    ])
+    rows = [(doc["_id"], doc["t"]) for doc in cursor]
+    if not rows:
+        return (), ()
+    labels, sizes = zip(*rows)
+    return labels, sizes
 
 def plot_category_pie():
     """
     Creates a pie chart showing spending distribution by aggregated general category.
 
-    Retrieves data from MongoDB, aggregates 'lunch' and 'dinner' under 'Food', and uses
-    Matplotlib to display the chart with general categories.
+    Retrieves per-category totals from MongoDB, aggregating 'lunch' and 'dinner' under 'Food',
+    and uses Matplotlib to display the chart with general categories.
 
     Returns:
         None
     """
-    client = MongoClient("mongodb://localhost:27017/")
-    db = client["expense_tracker"]
-    expenses = db["expenses"]
-    df = pd.DataFrame(list(expenses.find()))
-    category_sums = df.groupby("category")["amount"].sum()
+    labels, sizes = _sum_by("category")
     plt.figure(figsize=(8, 8))
-    plt.pie(category_sums, labels=category_sums.index, autopct="%1.1f%%")
+    plt.pie(sizes, labels=labels, autopct="%1.1f%%")
     plt.title("Spending by Category")
     plt.savefig("category_pie.png")  # Save instead of show for compatibility
 
@@ -37,18 +54,14 @@ def plot_payment_pie():
     """
     Creates a pie chart showing spending distribution by aggregated general payment method.
 
-    Retrieves data from MongoDB, aggregates 'TD debit' and 'td debit' under 'TD Debit', and
-    uses Matplotlib to display the chart with general payment methods.
+    Retrieves per-payment-method totals from MongoDB, aggregating 'TD debit' and 'td debit'
+    under 'TD Debit', and uses Matplotlib to display the chart with general payment methods.
 
     Returns:
         None
     """
-    client = MongoClient("mongodb://localhost:27017/")
-    db = client["expense_tracker"]
-    expenses = db["expenses"]
-    df = pd.DataFrame(list(expenses.find()))
-    payment_sums = df.groupby("payment_method")["amount"].sum()
+    labels, sizes = _sum_by("payment_method")
     plt.figure(figsize=(8, 8))
-    plt.pie(payment_sums, labels=payment_sums.index, autopct="%1.1f%%")
+    plt.pie(sizes, labels=labels, autopct="%1.1f%%")
     plt.title("Spending by Payment Method")
     plt.savefig("payment_pie.png")  # Save instead of show for compatibility
\ No newline at end of file
@@ -0,0 +1,292 @@
+"""
+test_analysis.py: Unit tests for analysis functions in the Personal Expense Tracker.
+
+This module tests the similarity matching used to map user-entered categories and payment
+methods to general labels.
+
+Functions:
+- test_category_similarity(): Tests mapping user-entered categories to general categories.
+- test_payment_similarity(): Tests mapping user-entered payment methods to general payment methods.
+- test_predict_expenses_matches_linear_regression(): Tests the closed-form fit against scikit-learn.
+- test_anomaly_mask_matches_numpy(): Tests the Numba anomaly mask against the NumPy expression.
+- test_forecast_by_category(): Tests per-category forecasting with Prophet stubbed out.
+- test_forecast_by_category_insufficient_data(): Tests that categories with too little data are skipped.
+- test_classifier_cached_when_unchanged(): Tests that an unchanged collection returns the cached classifier.
+- test_classifier_partial_fit_matches_full_fit(): Tests that training on new rows only matches a full fit.
+- test_classifier_refits_on_new_label(): Tests that a label unseen by the model forces a full refit.
+- test_classifier_refits_after_removal(): Tests that removing documents forces a full refit.
+- test_classifier_refits_after_removal_then_growth(): Tests that removals hidden by later inserts force a full refit.
+- test_classifier_insufficient_data(): Tests that fewer than 2 records yield no classifier.
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LinearRegression
+from src.analysis import ml_models, nlp
+from src.analysis.nlp import get_general_category_from_similarity, get_general_payment_method
+
+def test_category_similarity():
+    """
+    Tests get_general_category_from_similarity with exact, near, and unmatched inputs.
+
+    Returns:
+        None
+    """
+    assert get_general_category_from_similarity("lunch") == "Food"
+    assert get_general_category_from_similarity(" Dinner ") == "Food"
+    assert get_general_category_from_similarity("subwy") == "Transport"
+    assert get_general_category_from_similarity("random") == "Miscellaneous"
+
+def test_payment_similarity():
+    """
+    Tests get_general_payment_method with exact, differently cased, and unmatched inputs.
+
+    Returns:
+        None
+    """
+    assert get_general_payment_method("td debit") == "TD Debit"
+    assert get_general_payment_method("Td debit") == "TD Debit"
+    assert get_general_payment_method("visa") == "Credit Card"
+    assert get_general_payment_method("random") == "Miscellaneous"
+
+class _FakeDateAmounts:
+    """
+    In-memory stand-in for the 'expenses' collection read by predict_expenses.
+    """
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def find(self, query, projection):
+        return [{"date": date, "amount": amount} for date, amount in self.rows]
+
+def _linear_regression_prediction(rows):
+    dates = pd.to_datetime([date for date, _ in rows])
+    days = (dates - dates.min()).days.to_numpy()
+    model = LinearRegression().fit(days.reshape(-1, 1), [amount for _, amount in rows])
+    return model.predict([[days.max() + 30]])[0]
+
+@pytest.mark.parametrize("rows", [
+    [("2025-05-01", 10.0), ("2025-05-03", 14.0), ("2025-05-10", 9.5), ("2025-06-02", 30.0)],
+    [("2025-05-01", 10.0), ("2025-05-01", 20.0), ("2025-05-01", 45.0)],  # All expenses on the same day
+    [("2025-5-3", 12.0), ("2025-05-10", 8.0), ("2025-6-1", 20.0)]  # Unpadded dates from the GUI
+])
+def test_predict_expenses_matches_linear_regression(monkeypatch, rows):
+    """
+    Tests that predict_expenses gives the same prediction as scikit-learn's LinearRegression.
+
+    Returns:
+        None
+    """
+    monkeypatch.setattr(ml_models, "get_db", lambda: {"expenses": _FakeDateAmounts(rows)})
+    assert ml_models.predict_expenses() == pytest.approx(_linear_regression_prediction(rows))
+
+@pytest.mark.parametrize("dtype", [np.float32, np.float64])
+def test_anomaly_mask_matches_numpy(dtype):
+    """
+    Tests that _anomaly_mask equals distances.min(axis=1) > distances.mean().
+
+    Returns:
+        None
+    """
+    distances = np.random.default_rng(0).gamma(2.0, 3.0, size=(500, 3)).astype(dtype)
+    expected = distances.min(axis=1) > distances.mean()
+    assert np.array_equal(ml_models._anomaly_mask(distances), expected)
+
+def _stub_forecast_sources(monkeypatch, rows):
+    """
+    Replaces the MongoDB read and the Prophet fit used by forecast_expenses_by_category.
+
+    Args:
+        monkeypatch (pytest.MonkeyPatch): The pytest monkeypatch fixture.
+        rows (list): (date, amount, category) tuples returned as the expense data.
+
+    Returns:
+        list: Collects the history frames passed to each stubbed fit.
+    """
+    fitted = []
+
+    def fake_fit_one(df):
+        fitted.append(df)
+        return pd.DataFrame({"ds": pd.to_datetime(["2025-07-01"]), "yhat": [df["y"].mean()]})
+
+    data = pd.DataFrame(rows, columns=["date", "amount", "category"])
+    monkeypatch.setattr(ml_models, "get_db", lambda: {"expenses": None})
+    monkeypatch.setattr(ml_models, "find_pandas_all", lambda collection, query, schema: data.copy())
+    monkeypatch.setattr(ml_models, "_fit_one", fake_fit_one)
+    return fitted
+
+def test_forecast_by_category(monkeypatch):
+    """
+    Tests forecast_expenses_by_category with Prophet stubbed and fits run in-process.
+
+    Ensures one fit per category with at least 2 expenses and the expected output columns.
+
+    Returns:
+        None
+    """
+    fitted = _stub_forecast_sources(monkeypatch, [
+        ("2025-05-01", 10.0, "Food"),
+        ("2025-05-02", 20.0, "Food"),
+        ("2025-05-01", 3.0, "Transport"),
+        ("2025-05-03", 5.0, "Transport"),
+        ("2025-05-02", 9.0, "Entertainment")
+    ])
+    forecast = ml_models.forecast_expenses_by_category(n_jobs=1)
+    assert len(fitted) == 2
+    assert list(forecast.columns) == ["category", "ds", "yhat"]
+    assert forecast.set_index("category")["yhat"].to_dict() == {"Food": 15.0, "Transport": 4.0}
+
+def test_forecast_by_category_insufficient_data(monkeypatch):
+    """
+    Tests that forecast_expenses_by_category returns an empty frame when every category is skipped.
+
+    Returns:
+        None
+    """
+    fitted = _stub_forecast_sources(monkeypatch, [
+        ("2025-05-01", 10.0, "Food"),
+        ("2025-05-02", 3.0, "Transport")
+    ])
+    forecast = ml_models.forecast_expenses_by_category(n_jobs=1)
+    assert fitted == []
+    assert forecast.empty
+
+class _FakeExpenses:
+    """
+    In-memory stand-in for the 'expenses' collection used by the classifier training helper.
+
+    Supports estimated_document_count and find with an optional '_id' '$gt' filter and a sort on '_id'.
+    """
+
+    def __init__(self):
+        self.docs = []
+        self.queries = []
+        self.next_id = 1
+
+    def add(self, description, category):
+        self.docs.append({"_id": self.next_id, "description": description, "category": category})
+        self.next_id += 1
+
+    def estimated_document_count(self):
+        return len(self.docs)
+
+    def find(self, query, projection):
+        self.queries.append(query)
+        after = query.get("_id", {}).get("$gt", 0)
+        return _FakeCursor([doc for doc in self.docs if doc["_id"] > after])
+
+class _FakeCursor(list):
+    def sort(self, key, direction):
+        return sorted(self, key=lambda doc: doc[key], reverse=direction < 0)
+
+def _new_cache():
+    return {"n": -1, "last_id": None, "model": None, "vec": None}
+
+@pytest.fixture
+def fake_expenses(monkeypatch):
+    """
+    Points nlp.get_db at an in-memory collection seeded with two categorized expenses.
+
+    Returns:
+        _FakeExpenses: The fake collection.
+    """
+    expenses = _FakeExpenses()
+    expenses.add("Lunch at cafe", "Food")
+    expenses.add("Bus fare downtown", "Transport")
+    monkeypatch.setattr(nlp, "get_db", lambda: {"expenses": expenses})
+    return expenses
+
+def test_classifier_cached_when_unchanged(fake_expenses):
+    """
+    Tests that _train_classifier returns the cached objects without querying when the count is unchanged.
+
+    Returns:
+        None
+    """
+    cache = _new_cache()
+    model, vectorizer = nlp._train_classifier("category", cache)
+    queries = len(fake_expenses.queries)
+    assert nlp._train_classifier("category", cache) == (model, vectorizer)
+    assert nlp._train_classifier("category", cache)[0] is model
+    assert len(fake_expenses.queries) == queries
+
+def test_classifier_partial_fit_matches_full_fit(fake_expenses):
+    """
+    Tests that updating with only the new rows gives the same counts as fitting from scratch.
+
+    Returns:
+        None
+    """
+    cache = _new_cache()
+    model, _ = nlp._train_classifier("category", cache)
+    fake_expenses.add("Dinner at restaurant", "Food")
+    fake_expenses.add("Train ticket to work", "Transport")
+    updated, _ = nlp._train_classifier("category", cache)
+    assert updated is model
+    assert fake_expenses.queries[-1] == {"_id": {"$gt": 2}}
+    fresh, _ = nlp._train_classifier("category", _new_cache())
+    assert list(updated.classes_) == list(fresh.classes_)
+    assert np.array_equal(updated.class_count_, fresh.class_count_)
+    assert np.array_equal(updated.feature_count_, fresh.feature_count_)
+
+def test_classifier_refits_on_new_label(fake_expenses):
+    """
+    Tests that new rows with a label the model has not seen trigger a full refit.
+
+    Returns:
+        None
+    """
+    cache = _new_cache()
+    model, _ = nlp._train_classifier("category", cache)
+    fake_expenses.add("Movie night tickets", "Entertainment")
+    refit, _ = nlp._train_classifier("category", cache)
+    assert refit is not model
+    assert fake_expenses.queries[-1] == {}
+    assert list(refit.classes_) == ["Entertainment", "Food", "Transport"]
+
+def test_classifier_refits_after_removal(fake_expenses):
+    """
+    Tests that a shrinking collection triggers a full refit instead of an incremental update.
+
+    Returns:
+        None
+    """
+    fake_expenses.add("Groceries for the week", "Food")
+    cache = _new_cache()
+    model, _ = nlp._train_classifier("category", cache)
+    fake_expenses.docs.pop()
+    refit, _ = nlp._train_classifier("category", cache)
+    assert refit is not model
+    assert fake_expenses.queries[-1] == {}
+    assert refit.class_count_.sum() == 2
+
+def test_classifier_refits_after_removal_then_growth(fake_expenses):
+    """
+    Tests that a removal followed by enough inserts to grow the count still triggers a full refit.
+
+    Returns:
+        None
+    """
+    fake_expenses.add("Groceries for the week", "Food")
+    cache = _new_cache()
+    model, _ = nlp._train_classifier("category", cache)
+    fake_expenses.docs.pop(0)  # Remove a Food expense
+    fake_expenses.add("Taxi to the airport", "Transport")
+    fake_expenses.add("Subway pass", "Transport")
+    refit, _ = nlp._train_classifier("category", cache)
+    fresh, _ = nlp._train_classifier("category", _new_cache())
+    assert refit is not model
+    assert list(refit.class_count_) == list(fresh.class_count_) == [1, 3]
+    assert np.array_equal(refit.feature_count_, fresh.feature_count_)
+
+def test_classifier_insufficient_data(fake_expenses):
+    """
+    Tests that _train_classifier returns (None, None) when fewer than 2 records exist.
+
+    Returns:
+        None
+    """
+    fake_expenses.docs.pop()
+    assert nlp._train_classifier("category", _new_cache()) == (None, None)
\ No newline at end of file
@@ -5,10 +5,11 @@ This module tests the database functions to ensure data is correctly stored and
 
 Functions:
 - test_add_expense(): Tests adding an expense to MongoDB.
+- test_add_expenses_batch(): Tests adding several expenses to MongoDB in one batch.
 """
 
 import pytest
-from src.storage.database import add_expense_db, get_all_expenses
+from src.storage.database import add_expense_db, add_expenses_db, get_all_expenses
 
 def test_add_expense():
     """
@@ -25,6 +26,27 @@ def test_add_expense():
     assert any(exp["category"] == "Food" for exp in expenses)
 
     from src.storage.database import add_expense_db
+
+def test_add_expenses_batch():
+    """
+    Tests the add_expenses_db function by batch-adding expenses and verifying their refinement.
+
+    Ensures each expense is stored with its refined category and payment method.
+
+    Returns:
+        None
+    """
+    add_expenses_db([
+        {"date": "2025-05-24", "amount": 3.5, "category": "bus", "description": "Batch bus fare", "payment_method": "cash"},
+        {"date": "2025-05-24", "amount": 12.0, "category": "movie", "description": "Batch movie ticket", "payment_method": "visa"}
+    ])
+    expenses = get_all_expenses()
+    batch = {exp["description"]: exp for exp in expenses if exp["description"].startswith("Batch ")}
+    assert batch["Batch bus fare"]["category"] == "Transport"
+    assert batch["Batch bus fare"]["payment_method"] == "Cash"
+    assert batch["Batch movie ticket"]["category"] == "Entertainment"
+    assert batch["Batch movie ticket"]["payment_method"] == "Credit Card"
+
 add_expense_db("2025-05-23", 20.0, "lunch", "Lunch at cafe", "td debit")
 add_expense_db("2025-05-23", 25.0, "dinner", "Dinner at restaurant", "TD debit")
 from src.analysis.reporting import generate_report